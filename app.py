@@ -2,28 +2,158 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 import pandas as pd
 import numpy as np
-import re
 from datetime import datetime
 import os
 import traceback
-import io
-import gc
+import gzip
+import hashlib
+import codecs
+import pickle
+import threading
+from collections import OrderedDict
+
+# Index columns use Arrow-backed strings when pyarrow is installed, so the
+# CSVs are held as contiguous buffers and the variation regexes run natively
+try:
+    import pyarrow
+    import pyarrow.csv as pa_csv
+    STRING_DTYPE = 'string[pyarrow]'
+except ImportError:
+    pa_csv = None
+    STRING_DTYPE = 'string'
+
+# orjson encodes the large results payload several times faster than the
+# stdlib json behind app.json; it is optional like pyarrow
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 app = Flask(__name__)
 CORS(app)
 
-# Enable debug mode for better error messages
-app.config['DEBUG'] = True
+# Debug mode (and its reloader, which would rebuild the indexes on every
+# change) only when asked for, e.g. FLASK_DEBUG=1 for local development
+DEBUG = os.environ.get('FLASK_DEBUG') == '1'
+app.config['DEBUG'] = DEBUG
+
+# Gzipped JSON bodies of recent successful /api/calculate responses, keyed by
+# (upload digest, limit) so identical re-uploads skip the analysis entirely
+RESPONSE_CACHE_SIZE = 64
+response_cache = OrderedDict()
+response_cache_lock = threading.Lock()
+
+def dumps_json(payload):
+    """Serialize a response payload to UTF-8 JSON bytes, sorted like jsonify"""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return app.json.dumps(payload).encode('utf-8')
+
+def gzip_json_response(gzipped_body):
+    """Build a JSON response from a cached gzipped body"""
+    if 'gzip' in request.accept_encodings:
+        response = app.response_class(gzipped_body, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = app.response_class(gzip.decompress(gzipped_body), mimetype='application/json')
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+# Title cleaning patterns, applied column-wise by extract_variations_column.
+# Without pyarrow they run on Python's re, like script.py's; Arrow runs them
+# on RE2, where \s and \d only match ASCII, so there '(٢٠٢٠)' or a no-break
+# space before 'Season' is left in the title
+YEAR_PATTERN = r'\s*[\(\[]\d{4}[\)\]]\s*'
+SEASON_PATTERN = r':\s*Season\s+\d+\s*:'
+
+def extract_variations_column(titles):
+    """Extract the title variations to match for a whole title column, one tuple per row"""
+    # Plain pattern strings (not compiled objects) let Arrow-backed columns
+    # run every regex as a native pyarrow.compute kernel instead of per element
+    cleaned = (titles.astype(STRING_DTYPE).str.strip()
+               .str.replace(YEAR_PATTERN, '', regex=True)
+               .str.replace(SEASON_PATTERN, ':', regex=True)
+               .str.strip())
+    
+    # Episode (after the last ':') and series (before the first ':') titles
+    has_colon = cleaned.str.contains(':', regex=False).fillna(False)
+    episode = cleaned.str.replace(r'(?s)^.*:', '', regex=True).str.strip().where(has_colon, '')
+    series = cleaned.str.replace(r'(?s):.*$', '', regex=True).str.strip().where(has_colon, '')
+    
+    variations = [cleaned, episode, series]
+    for var in variations.copy():
+        starts_with_the = var.str.lower().str.startswith('the ').fillna(False)
+        variations.append(var.str.slice(4).str.strip().where(starts_with_the, ''))
+    
+    # Drop empty and repeated variations per row, keeping their order
+    return [
+        tuple(dict.fromkeys(var for var in row if isinstance(var, str) and var))
+        for row in zip(*(var.tolist() for var in variations))
+    ]
+
+# IMDb placeholders for missing values, parsed straight to <NA>
+NA_VALUES = ['\\N', '', 'N/A']
+
+# Bump when the pickled index layout or its keys change so stale caches are rebuilt
+INDEX_CACHE_VERSION = 5
+
+def lower_titles(titles):
+    """Lowercase a title column with str.lower, the same rule the lookups use"""
+    # Not .str.lower(): on Arrow-backed columns that runs utf8_lower, which
+    # differs from str.lower for e.g. 'İ' and final sigma
+    return [title.lower() if isinstance(title, str) else None for title in titles.tolist()]
+
+def read_csv_chunks(path, columns, chunk_size):
+    """Yield the given columns of a CSV as string DataFrame chunks"""
+    if pa_csv is None:
+        yield from pd.read_csv(path, usecols=columns, dtype=STRING_DTYPE, na_values=NA_VALUES, keep_default_na=False, chunksize=chunk_size)
+        return
+    
+    # Arrow parses multi-threaded in C++ and only converts the projected columns
+    reader = pa_csv.open_csv(
+        path,
+        read_options=pa_csv.ReadOptions(block_size=64 << 20, use_threads=True),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=columns,
+            column_types={col: pyarrow.string() for col in columns},
+            null_values=NA_VALUES,
+            strings_can_be_null=True
+        )
+    )
+    for batch in reader:
+        yield batch.to_pandas(types_mapper={pyarrow.string(): pd.StringDtype('pyarrow')}.get)
+
+def entries_to_records(entries):
+    """Transpose column-wise entries ({field: [values]}) into a list of dicts"""
+    fields = list(entries)
+    return [dict(zip(fields, row)) for row in zip(*entries.values())]
 
 class ChunkedRuntimeCalculator:
     def __init__(self):
-        self.chunk_size = 10000  # Process 10k rows at a time
+        self.chunk_size = 200000  # Rows per CSV chunk while building the indexes
+        self.scan_chunk_size = 10000  # Rows per chunk of the old linear scan, which hits are ranked by
         self.loaded = False
         self.moviedata_file = 'moviedata.csv'  # Local file
         self.alttitles_file = 'alternatetitles.csv'  # Local file
+        self.index_cache_file = f'title_indexes.cache-v{INDEX_CACHE_VERSION}.pkl'
+        
+        # Lowercase title -> (runtime, tconst, row), built once by load_data;
+        # row is the movie's position in moviedata.csv and every index shares
+        # one value tuple per movie (see movie_by_tconst)
+        self.primary_idx = {}
+        self.original_idx = {}
+        self.alt_idx = {}
+        self.movie_by_tconst = {}
+        
+        # Stripped title -> (runtime, tconst, match_info, variations), shared across
+        # requests, least recently used first, and cleared whenever the indexes
+        # are rebuilt
+        self.resolved_cache_size = 100000
+        self.resolved_cache = OrderedDict()
+        self.resolved_cache_lock = threading.Lock()
         
     def load_data(self):
-        """Check if local CSV files exist and are readable"""
+        """Check the local CSV files and build the in-memory title indexes"""
         try:
             # Check if files exist
             files_to_check = [self.moviedata_file, self.alttitles_file]
@@ -36,155 +166,179 @@ class ChunkedRuntimeCalculator:
             if missing_files:
                 return False, f"Missing local CSV files: {missing_files}. Please upload: {', '.join(missing_files)} to your deployment."
             
-            # Test that we can read the headers
+            # Reuse the indexes pickled by an earlier start while they are newer
+            # than both CSVs; otherwise stream each CSV once and index it
             try:
-                moviedata_sample = pd.read_csv(self.moviedata_file, nrows=1)
-                alttitles_sample = pd.read_csv(self.alttitles_file, nrows=1)
-                print(f"Moviedata columns: {list(moviedata_sample.columns)}")
-                print(f"Alt titles columns: {list(alttitles_sample.columns)}")
+                if not self.load_cached_indexes():
+                    self.build_indexes()
+                    self.save_cached_indexes()
             except Exception as e:
-                return False, f"Error reading CSV headers: {str(e)}"
+                return False, f"Error reading CSV files: {str(e)}"
             
             self.loaded = True
-            print("✅ Local CSV files ready for chunked processing")
-            return True, "Local CSV files loaded and ready"
+            print(f"✅ Indexed {len(self.primary_idx)} primary, {len(self.original_idx)} original and {len(self.alt_idx)} alternative titles")
+            return True, "Local CSV files loaded and indexed"
             
         except Exception as e:
             print(f"Error in load_data: {str(e)}")
             print(traceback.format_exc())
             return False, f"Error preparing data: {str(e)}"
 
-    def clean_title_for_matching(self, title):
-        """Clean title for better matching"""
-        if pd.isna(title) or not isinstance(title, str):
-            return ""
-        
-        cleaned = title.strip()
-        cleaned = re.sub(r'\s*[\(\[]\d{4}[\)\]]\s*', '', cleaned)
-        cleaned = re.sub(r':\s*Season\s+\d+\s*:', ':', cleaned)
-        return cleaned.strip()
-
-    def extract_variations(self, title):
-        """Extract different title variations for matching"""
-        if pd.isna(title) or not isinstance(title, str):
-            return [""]
-        
-        variations = []
-        cleaned = self.clean_title_for_matching(title)
-        variations.append(cleaned)
-        
-        if ':' in cleaned:
-            episode_title = cleaned.split(':')[-1].strip()
-            if episode_title:
-                variations.append(episode_title)
+    def build_indexes(self):
+        """Read the CSVs chunk by chunk into title -> runtime lookup dicts"""
+        primary_idx, original_idx, movie_by_tconst, alt_idx = {}, {}, {}, {}
+        
+        moviedata_reader = read_csv_chunks(
+            self.moviedata_file,
+            ['tconst', 'primaryTitle', 'originalTitle', 'runtimeMinutes'],
+            self.chunk_size
+        )
+        first_row = 0
+        for chunk in moviedata_reader:
+            # Placeholders are already <NA>; keep only rows with a usable runtime
+            runtimes = pd.to_numeric(chunk['runtimeMinutes'], errors='coerce').astype('Int32')
+            valid = (runtimes > 0).fillna(False)
+            rows = np.flatnonzero(valid.to_numpy()) + first_row
+            first_row += len(chunk)
+            chunk = chunk[valid]
+            values = list(zip(runtimes[valid].tolist(), chunk['tconst'].tolist(), rows.tolist()))
             
-            series_title = cleaned.split(':')[0].strip()
-            if series_title:
-                variations.append(series_title)
-        
-        for var in variations.copy():
-            if var.lower().startswith('the '):
-                variations.append(var[4:].strip())
-        
-        seen = set()
-        unique_variations = []
-        for var in variations:
-            if var and var not in seen:
-                seen.add(var)
-                unique_variations.append(var)
-        
-        return unique_variations
+            # Earlier rows win, matching the old first-hit scan order
+            for tconst, value in zip(chunk['tconst'].tolist(), values):
+                movie_by_tconst.setdefault(tconst, value)
+            for column, index in (('primaryTitle', primary_idx), ('originalTitle', original_idx)):
+                for key, value in zip(lower_titles(chunk[column]), values):
+                    if isinstance(key, str):
+                        index.setdefault(key, value)
+        
+        alttitles_reader = read_csv_chunks(
+            self.alttitles_file,
+            ['titleId', 'title'],
+            self.chunk_size
+        )
+        for chunk in alttitles_reader:
+            # Only alternative titles of movies we have a runtime for are useful;
+            # reusing the movie's tuple avoids a tconst string per alt row.
+            # Keys already in the primary/original indexes are skipped: those
+            # strategies probe every variation first, so the alt entry could
+            # never be reached
+            for key, tconst in zip(lower_titles(chunk['title']), chunk['titleId'].tolist()):
+                value = movie_by_tconst.get(tconst)
+                if value and isinstance(key, str) and key not in primary_idx and key not in original_idx:
+                    alt_idx.setdefault(key, value)
+        
+        self.set_indexes(primary_idx, original_idx, movie_by_tconst, alt_idx)
+
+    def set_indexes(self, primary_idx, original_idx, movie_by_tconst, alt_idx):
+        """Swap in new indexes and forget titles resolved against the old ones"""
+        self.primary_idx = primary_idx
+        self.original_idx = original_idx
+        self.movie_by_tconst = movie_by_tconst
+        self.alt_idx = alt_idx
+        with self.resolved_cache_lock:
+            self.resolved_cache.clear()
+
+    def load_cached_indexes(self):
+        """Load the indexes pickled by a previous start, if still fresh"""
+        cache_file = self.index_cache_file
+        if not os.path.exists(cache_file):
+            return False
+        if os.path.getmtime(cache_file) < max(os.path.getmtime(self.moviedata_file), os.path.getmtime(self.alttitles_file)):
+            return False
+        
+        try:
+            with open(cache_file, 'rb') as f:
+                self.set_indexes(*pickle.load(f))
+        except (OSError, EOFError, pickle.UnpicklingError, TypeError) as e:
+            print(f"Ignoring unreadable index cache {cache_file}: {e}")
+            return False
+        return True
+
+    def save_cached_indexes(self):
+        """Pickle the indexes next to the CSVs for the next start"""
+        # Pickle keeps the per-movie value tuples shared across the indexes
+        indexes = (self.primary_idx, self.original_idx, self.movie_by_tconst, self.alt_idx)
+        temp_file = f"{self.index_cache_file}.tmp"
+        try:
+            with open(temp_file, 'wb') as f:
+                pickle.dump(indexes, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file, self.index_cache_file)
+            print(f"✅ Cached title indexes as {self.index_cache_file}")
+        except OSError as e:
+            print(f"Could not write index cache {self.index_cache_file}: {e}")
 
     def find_runtime_chunked(self, title_variations):
-        """Find runtime using chunked reading to minimize memory usage"""
+        """Find runtime with dict lookups against the in-memory indexes"""
         
         if not self.loaded:
             return None, None, "Database not loaded"
             
-        # Convert variations to lowercase for faster comparison
-        variations_lower = [v.lower() for v in title_variations if v]
-        if not variations_lower:
+        # Pair each variation with its lowercase lookup key
+        variations = [(v, v.lower()) for v in title_variations if v]
+        if not variations:
             return None, None, "No valid variations"
+        
+        # Strategies 1 and 2: primary and original title. The old scan read
+        # moviedata.csv chunk by chunk and, within a chunk, tried every
+        # variation against the primary, then the original titles; hits are
+        # ranked the same way so the earliest (most popular) movie still wins
+        best = None
+        for strategy, (index, label) in enumerate(((self.primary_idx, 'Primary'), (self.original_idx, 'Original'))):
+            for position, (var, key) in enumerate(variations):
+                hit = index.get(key)
+                if hit:
+                    rank = (hit[2] // self.scan_chunk_size, strategy, position)
+                    if best is None or rank < best[0]:
+                        best = (rank, hit, f"{label} title match: '{var}'")
+        if best:
+            _, hit, match_info = best
+            return hit[0], hit[1], match_info
+        
+        # Strategy 3: alternate title, only when no movie title matched
+        for var, key in variations:
+            hit = self.alt_idx.get(key)
+            if hit:
+                return hit[0], hit[1], f"Alt title match: '{var}'"
+        
+        return None, None, "Not found in title indexes"
+
+    def resolve_titles(self, titles):
+        """Resolve distinct stripped titles to (runtime, tconst, match_info, variations)"""
+        with self.resolved_cache_lock:
+            cached = {title: self.resolved_cache[title] for title in titles if title in self.resolved_cache}
+            for title in cached:
+                self.resolved_cache.move_to_end(title)
+        
+        # Only titles never seen before go through variation extraction and the probes
+        pending = [title for title in titles if title not in cached]
+        if pending:
+            # Many titles match a primary title exactly as written in the first
+            # scan chunk, which no other variation can outrank; only the rest
+            # need the variation machinery
+            needs_variations = []
+            for title in pending:
+                hit = self.primary_idx.get(title.lower())
+                if hit and hit[2] < self.scan_chunk_size:
+                    cached[title] = (hit[0], hit[1], f"Primary title match: '{title}'", (title,))
+                else:
+                    needs_variations.append(title)
             
-        try:
-            # Strategy 1: Search in moviedata chunks
-            moviedata_reader = pd.read_csv(self.moviedata_file, chunksize=self.chunk_size, low_memory=False)
-            
-            for chunk_idx, chunk in enumerate(moviedata_reader):
-                # Clean up memory
-                if chunk_idx > 0 and chunk_idx % 10 == 0:
-                    gc.collect()
-                
-                # Check primary title
-                if 'primaryTitle' in chunk.columns:
-                    chunk['primaryTitle_lower'] = chunk['primaryTitle'].astype(str).str.lower()
-                    for idx, var in enumerate(variations_lower):
-                        match = chunk[chunk['primaryTitle_lower'] == var]
-                        if not match.empty:
-                            runtime = match.iloc[0]['runtimeMinutes']
-                            if pd.notna(runtime) and str(runtime).strip() not in ['', '\\N', 'N/A']:
-                                try:
-                                    runtime_int = int(float(runtime))
-                                    return runtime_int, match.iloc[0]['tconst'], f"Primary title match: '{title_variations[idx]}'"
-                                except:
-                                    continue
-                
-                # Check original title
-                if 'originalTitle' in chunk.columns:
-                    chunk['originalTitle_lower'] = chunk['originalTitle'].astype(str).str.lower()
-                    for idx, var in enumerate(variations_lower):
-                        match = chunk[chunk['originalTitle_lower'] == var]
-                        if not match.empty:
-                            runtime = match.iloc[0]['runtimeMinutes']
-                            if pd.notna(runtime) and str(runtime).strip() not in ['', '\\N', 'N/A']:
-                                try:
-                                    runtime_int = int(float(runtime))
-                                    return runtime_int, match.iloc[0]['tconst'], f"Original title match: '{title_variations[idx]}'"
-                                except:
-                                    continue
-            
-            # Strategy 2: Search in alternate titles chunks
-            alttitles_reader = pd.read_csv(self.alttitles_file, chunksize=self.chunk_size, low_memory=False)
-            
-            for chunk_idx, alt_chunk in enumerate(alttitles_reader):
-                if chunk_idx > 0 and chunk_idx % 10 == 0:
-                    gc.collect()
-                
-                if 'title' in alt_chunk.columns and 'titleId' in alt_chunk.columns:
-                    alt_chunk['title_lower'] = alt_chunk['title'].astype(str).str.lower()
-                    
-                    for idx, var in enumerate(variations_lower):
-                        alt_match = alt_chunk[alt_chunk['title_lower'] == var]
-                        if not alt_match.empty:
-                            tconst = alt_match.iloc[0]['titleId']
-                            
-                            # Now find this tconst in moviedata
-                            moviedata_reader2 = pd.read_csv(self.moviedata_file, chunksize=self.chunk_size, low_memory=False)
-                            
-                            for movie_chunk in moviedata_reader2:
-                                movie_match = movie_chunk[movie_chunk['tconst'] == tconst]
-                                if not movie_match.empty:
-                                    runtime = movie_match.iloc[0]['runtimeMinutes']
-                                    if pd.notna(runtime) and str(runtime).strip() not in ['', '\\N', 'N/A']:
-                                        try:
-                                            runtime_int = int(float(runtime))
-                                            return runtime_int, tconst, f"Alt title match: '{title_variations[idx]}'"
-                                        except:
-                                            continue
-                                    break  # Found the tconst, no need to continue
-            
-            return None, None, "Not found after chunked search"
-            
-        except Exception as e:
-            print(f"Error in chunked search: {str(e)}")
-            return None, None, f"Search error: {str(e)}"
+            all_variations = extract_variations_column(pd.Series(needs_variations, dtype=STRING_DTYPE))
+            for title, variations in zip(needs_variations, all_variations):
+                cached[title] = self.find_runtime_chunked(variations) + (variations,)
+            with self.resolved_cache_lock:
+                for title in pending:
+                    self.resolved_cache[title] = cached[title]
+                while len(self.resolved_cache) > self.resolved_cache_size:
+                    self.resolved_cache.popitem(last=False)
+        
+        return [cached[title] for title in titles]
 
     def analyze_watch_history(self, watchhistory_data, limit=None):
-        """Analyze watch history using chunked processing"""
+        """Analyze watch history by joining resolved titles back onto its rows
         
-        total_runtime = 0
-        found_entries = []
-        not_found_entries = []
+        Entries are returned column-wise ({field: [values]}); see entries_to_records.
+        """
         
         # Convert to DataFrame if it's not already
         if isinstance(watchhistory_data, list):
@@ -196,60 +350,50 @@ class ChunkedRuntimeCalculator:
         if limit:
             watchhistory_df = watchhistory_df.head(limit)
         
-        # Process in smaller batches to manage memory
-        batch_size = 50  # Process 50 titles at a time
-        total_rows = len(watchhistory_df)
+        columns = {col.lower(): col for col in watchhistory_df.columns}
+        title_col = watchhistory_df[columns['title']] if 'title' in columns else pd.Series('', index=watchhistory_df.index)
+        date_col = watchhistory_df[columns['date']] if 'date' in columns else pd.Series('', index=watchhistory_df.index)
         
-        for batch_start in range(0, total_rows, batch_size):
-            batch_end = min(batch_start + batch_size, total_rows)
-            batch_df = watchhistory_df.iloc[batch_start:batch_end]
-            
-            print(f"Processing batch {batch_start//batch_size + 1}/{(total_rows-1)//batch_size + 1} ({batch_start+1}-{batch_end}/{total_rows})")
-            
-            for idx, row in batch_df.iterrows():
-                title = row.get('Title', row.get('title', ''))
-                date = row.get('Date', row.get('date', ''))
-                
-                title_str = str(title) if not pd.isna(title) else 'nan'
-                
-                if title_str in ['nan', 'None', ''] or title_str.strip() == '':
-                    not_found_entries.append({
-                        'original_title': title_str,
-                        'variations_tried': '',
-                        'reason': 'Empty/Invalid title',
-                        'date': str(date) if not pd.isna(date) else ''
-                    })
-                    continue
-                
-                variations = self.extract_variations(title_str)
-                runtime, tconst, match_info = self.find_runtime_chunked(variations)
-                
-                if runtime:
-                    total_runtime += runtime
-                    found_entries.append({
-                        'original_title': title_str,
-                        'matched_via': match_info,
-                        'runtime': runtime,
-                        'tconst': tconst,
-                        'date': str(date) if not pd.isna(date) else ''
-                    })
-                else:
-                    not_found_entries.append({
-                        'original_title': title_str,
-                        'variations_tried': str(variations),
-                        'reason': 'No matches found in chunked search',
-                        'date': str(date) if not pd.isna(date) else ''
-                    })
-            
-            # Force garbage collection after each batch
-            gc.collect()
+        print(f"Processing {len(watchhistory_df)} titles")
+        
+        titles = title_col.fillna('nan').astype(str)
+        invalid = titles.isin(['nan', 'None', '']) | (titles.str.strip() == '')
+        # Variations start from the stripped title, so titles that only differ
+        # in surrounding whitespace share one lookup; invalid rows get no key
+        title_keys = titles.str.strip().where(~invalid)
+        history = pd.DataFrame({
+            'original_title': titles.tolist(),
+            'title_key': title_keys.tolist(),
+            'date': date_col.fillna('').astype(str).tolist()
+        })
+        
+        # Resolve each distinct title once, reusing results from earlier requests
+        unique_keys = title_keys[~invalid].drop_duplicates().tolist()
+        resolved = pd.DataFrame(
+            self.resolve_titles(unique_keys),
+            columns=['runtime', 'tconst', 'matched_via', 'variations_tried']
+        )
+        resolved['runtime'] = resolved['runtime'].astype('Int64')
+        resolved['title_key'] = unique_keys
+        resolved['variations_tried'] = resolved['variations_tried'].map(lambda variations: str(list(variations)))
+        
+        # Join the results onto every row, then split on whether a runtime was found
+        result = history.merge(resolved, on='title_key', how='left')
+        found = result['runtime'].notna().to_numpy()
+        
+        found_df = result.loc[found, ['original_title', 'matched_via', 'runtime', 'tconst', 'date']]
+        not_found_df = result.loc[~found, ['original_title', 'variations_tried', 'date']]
+        not_found_df.insert(2, 'reason', np.where(
+            invalid.to_numpy()[~found], 'Empty/Invalid title', 'No matches found in chunked search'
+        ))
+        not_found_df['variations_tried'] = not_found_df['variations_tried'].fillna('')
         
         return {
-            'total_runtime': total_runtime,
-            'found_count': len(found_entries),
-            'not_found_count': len(not_found_entries),
-            'found_entries': found_entries,
-            'not_found_entries': not_found_entries
+            'total_runtime': int(found_df['runtime'].sum()),
+            'found_count': len(found_df),
+            'not_found_count': len(not_found_df),
+            'found_entries': found_df.to_dict('list'),
+            'not_found_entries': not_found_df.to_dict('list')
         }
 
 @app.route('/')
@@ -258,7 +402,7 @@ def index():
     return jsonify({
         "status": "Local Files Movie Runtime Calculator API",
         "version": "2.1",
-        "features": ["Chunked CSV processing", "Local file access", "Memory-efficient"],
+        "features": ["In-memory title indexes", "Local file access", "Chunked CSV loading"],
         "endpoints": {
             "POST /api/calculate": "Calculate total runtime from watch history CSV",
             "GET /api/status": "Check if local CSV files are loaded"
@@ -280,7 +424,7 @@ def api_status():
     return jsonify({
         "success": True,
         "loaded": True,
-        "message": "Local CSV files ready for chunked processing",
+        "message": "Local CSV files indexed and ready",
         "chunk_size": calculator.chunk_size,
         "files": {
             "moviedata": os.path.exists(calculator.moviedata_file),
@@ -323,66 +467,91 @@ def calculate_runtime():
                 "error": "File must be a CSV file"
             }), 400
         
-        # Read CSV from uploaded file
-        try:
-            # Read the file content
-            file_content = file.read()
-            
-            # Try different encodings
-            for encoding in ['utf-8', 'latin-1', 'cp1252']:
+        # Get optional limit parameter
+        limit = request.form.get('limit')
+        if limit:
+            try:
+                limit = int(limit)
+                if limit <= 0:
+                    limit = None
+            except:
+                limit = None
+        
+        # Answer identical uploads (e.g. retries) from the response cache. The
+        # same pass checks the bytes are valid UTF-8, otherwise Latin-1 is used
+        digest = hashlib.blake2b()
+        utf8_decoder = codecs.getincrementaldecoder('utf-8')()
+        encoding = 'utf-8'
+        for block in iter(lambda: file.stream.read(1 << 20), b''):
+            digest.update(block)
+            if encoding == 'utf-8':
                 try:
-                    file_string = file_content.decode(encoding)
-                    file_io = io.StringIO(file_string)
-                    watchhistory_df = pd.read_csv(file_io)
-                    break
+                    utf8_decoder.decode(block)
                 except UnicodeDecodeError:
-                    continue
-            else:
-                return jsonify({
-                    "success": False,
-                    "error": "Could not decode CSV file. Please ensure it's saved as UTF-8."
-                }), 400
-                
+                    encoding = 'latin-1'
+        if encoding == 'utf-8':
+            try:
+                utf8_decoder.decode(b'', final=True)
+            except UnicodeDecodeError:
+                encoding = 'latin-1'
+        file.stream.seek(0)
+        cache_key = (digest.hexdigest(), limit or None)
+        
+        with response_cache_lock:
+            cached_body = response_cache.get(cache_key)
+            if cached_body is not None:
+                response_cache.move_to_end(cache_key)
+        if cached_body is not None:
+            return gzip_json_response(cached_body)
+        
+        # Pick the title and date columns from the header alone, then parse just
+        # those straight from the stream as strings: no type inference, and
+        # titles like "1917" or numeric dates keep their exact text
+        try:
+            header = pd.read_csv(file.stream, encoding=encoding, nrows=0).columns.tolist()
+            file.stream.seek(0)
         except Exception as e:
             return jsonify({
                 "success": False,
                 "error": f"Error reading CSV file: {str(e)}"
             }), 400
         
-        # Check if CSV has required columns
-        available_columns = watchhistory_df.columns.tolist()
-        title_column = None
-        
-        # Look for title column (case insensitive)
-        for col in available_columns:
-            if col.lower() in ['title', 'name', 'movie', 'show']:
-                title_column = col
-                break
+        # First matching column wins (case insensitive)
+        columns_by_name = {}
+        for col in header:
+            columns_by_name.setdefault(col.lower(), col)
+        title_column = next((col for col in header if col.lower() in ('title', 'name', 'movie', 'show')), None)
+        date_column = columns_by_name.get('date')
         
         if not title_column:
             return jsonify({
                 "success": False,
-                "error": f"CSV must contain a title column. Found columns: {available_columns}"
+                "error": f"CSV must contain a title column. Found columns: {header}"
             }), 400
         
-        # Rename the title column to standardize
-        if title_column != 'Title':
-            watchhistory_df = watchhistory_df.rename(columns={title_column: 'Title'})
-        
-        # Get optional limit parameter
-        limit = request.form.get('limit')
-        if limit:
-            try:
-                limit = int(limit)
-                if limit <= 0:
-                    limit = None
-            except:
-                limit = None
+        standard_names = {title_column: 'Title', date_column: 'Date'}
+        try:
+            watchhistory_df = pd.read_csv(
+                file.stream,
+                encoding=encoding,
+                usecols=[col for col in standard_names if col],
+                dtype=STRING_DTYPE
+            )
+        except Exception as e:
+            return jsonify({
+                "success": False,
+                "error": f"Error reading CSV file: {str(e)}"
+            }), 400
+        watchhistory_df.columns = [standard_names[col] for col in watchhistory_df.columns]
         
         # Process the watch history
         print(f"Starting analysis of {len(watchhistory_df)} titles...")
         results = calculator.analyze_watch_history(watchhistory_df, limit=limit)
         
+        # The API contract is a list of entry objects
+        results['found_entries'] = entries_to_records(results['found_entries'])
+        results['not_found_entries'] = entries_to_records(results['not_found_entries'])
+        
         # Add some calculated fields for convenience
         total_count = results['found_count'] + results['not_found_count']
         results['total_count'] = total_count
@@ -391,14 +560,18 @@ def calculate_runtime():
         results['total_days'] = results['total_runtime'] / (60 * 24)
         results['avg_runtime'] = results['total_runtime'] / results['found_count'] if results['found_count'] > 0 else 0
         
-        # Force garbage collection
-        gc.collect()
-        
-        return jsonify({
+        gzipped_body = gzip.compress(dumps_json({
             "success": True,
             "results": results,
             "message": f"Processed {total_count} titles, found {results['found_count']} matches using local CSV files"
-        })
+        }))
+        
+        with response_cache_lock:
+            response_cache[cache_key] = gzipped_body
+            if len(response_cache) > RESPONSE_CACHE_SIZE:
+                response_cache.popitem(last=False)
+        
+        return gzip_json_response(gzipped_body)
         
     except Exception as e:
         return jsonify({
@@ -407,9 +580,17 @@ def calculate_runtime():
             "traceback": traceback.format_exc()
         }), 500
 
-# Initialize calculator
+# Initialize calculator and build the indexes at import time, so a preloading
+# gunicorn master (see gunicorn.conf.py) builds them once for all its workers
+def _warm_calculator():
+    """Load the calculator's indexes, reporting a failure instead of raising"""
+    loaded, load_message = calculator.load_data()
+    if not loaded:
+        print(f"⚠️ Index warm-up failed: {load_message}; retrying on the first request")
+
 calculator = ChunkedRuntimeCalculator()
+_warm_calculator()
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=port, debug=DEBUG)
\ No newline at end of file
@@ -0,0 +1,17 @@
+# Picked up automatically by `gunicorn app:app` from the project directory.
+import gc
+
+# Import app.py (and build the title indexes) once in the master; forked
+# workers then share the index memory copy-on-write instead of each loading it
+preload_app = True
+
+# A few threads per worker keep slow uploads from blocking other requests;
+# the worker count itself follows WEB_CONCURRENCY
+worker_class = 'gthread'
+threads = 4
+
+
+def pre_fork(server, worker):
+    # Move the preloaded objects out of the collector's reach so its passes in
+    # the workers don't touch (and unshare) the pages holding the indexes
+    gc.freeze()
@@ -1,7 +1,162 @@
 import pandas as pd
 import numpy as np
 import re
+import os
+import csv
+import pickle
+import logging
 from datetime import datetime
+from collections import OrderedDict
+
+# Per-title progress goes to the debug log; set VERBOSE=1 to see it
+log = logging.getLogger(__name__)
+
+# Title cleaning patterns, compiled once
+_YEAR_RE = re.compile(r'\s*[\(\[]\d{4}[\)\]]\s*')
+_SEASON_RE = re.compile(r':\s*Season\s+\d+\s*:')
+_THE_RE = re.compile(r'^the\s+', re.IGNORECASE)
+
+# Reference CSV columns actually used for matching
+MOVIEDATA_COLUMNS = ['tconst', 'primaryTitle', 'originalTitle', 'runtimeMinutes']
+ALTTITLES_COLUMNS = ['titleId', 'title']
+
+# Title columns use Arrow-backed strings when pyarrow is installed, which turns
+# the .str scans in the partial-match strategies into Arrow compute kernels
+try:
+    import pyarrow
+    import pyarrow.csv as pa_csv
+    import pyarrow.compute as pc
+    TITLE_DTYPE = 'string[pyarrow]'
+except ImportError:
+    pa_csv = pc = None
+    TITLE_DTYPE = 'string'
+
+# Watch history rows processed per chunk when read with pandas (Arrow's
+# streaming reader sizes its own batches); bounds the per-chunk temporaries
+HISTORY_CHUNK_SIZE = 50_000
+
+# What reading the streamed watch history can raise part-way through
+HISTORY_READ_ERRORS = (pd.errors.ParserError, UnicodeDecodeError, OSError)
+if pa_csv is not None:
+    HISTORY_READ_ERRORS += (pyarrow.ArrowInvalid,)
+
+# Most recently used raw titles whose match result is kept across chunks
+RESOLVED_CACHE_SIZE = 100_000
+
+# Bump when the cached frame layout changes so stale caches are rebuilt
+CACHE_VERSION = 2
+
+def load_cached_csv(csv_path, columns):
+    """Load a reference CSV through a binary cache written next to it"""
+    # Frames parsed with pyarrow hold Arrow-backed strings that only unpickle
+    # with pyarrow installed, so each backend keeps its own cache file
+    backend = 'arrow' if pa_csv is not None else 'pandas'
+    cache_path = f"{os.path.splitext(csv_path)[0]}.cache-v{CACHE_VERSION}-{backend}.pkl"
+    
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(csv_path):
+        try:
+            return pd.read_pickle(cache_path)
+        except (OSError, EOFError, pickle.UnpicklingError, ImportError, AttributeError, TypeError, ValueError) as e:
+            print(f"Ignoring unreadable cache {cache_path}: {e}")
+    
+    # Parse only the needed columns, all as strings: skips tokenizing the rest
+    # and pandas' type inference. Only IMDb's \N marker counts as missing so
+    # titles such as "None" or "NA" survive.
+    if pa_csv is not None:
+        # Arrow's multi-threaded C++ parser, same projection and null marker
+        table = pa_csv.read_csv(
+            csv_path,
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=columns,
+                column_types={col: pyarrow.string() for col in columns},
+                null_values=['\\N'],
+                strings_can_be_null=True
+            )
+        )
+        df = table.to_pandas(types_mapper={pyarrow.string(): pd.StringDtype()}.get)
+    else:
+        df = pd.read_csv(
+            csv_path,
+            usecols=columns,
+            dtype={col: 'string' for col in columns},
+            na_values=['\\N'],
+            keep_default_na=False
+        )[columns]
+    # Write next to the final path and swap it in, so an interrupted run never
+    # leaves a truncated cache that looks fresher than the CSV
+    temp_path = f"{cache_path}.tmp"
+    try:
+        df.to_pickle(temp_path)
+        os.replace(temp_path, cache_path)
+        print(f"✓ Cached {csv_path} as {cache_path}")
+    except OSError as e:
+        print(f"Could not write cache {cache_path}: {e}")
+    
+    return df
+
+def open_history_chunks(csv_path):
+    """Open the watch history as an iterator of DataFrame chunks of its title and date columns"""
+    
+    # Project the columns by name from the header; without a title column
+    # there is nothing to match (and Arrow would read every column)
+    header = pd.read_csv(csv_path, nrows=0).columns.tolist()
+    columns = [col for col in header if col.lower() in ('title', 'date')]
+    if not any(col.lower() == 'title' for col in columns):
+        raise ValueError(f"{csv_path} must contain a title column. Found columns: {header}")
+    
+    def read_with_pandas():
+        return pd.read_csv(
+            csv_path,
+            usecols=columns,
+            dtype='string',
+            chunksize=HISTORY_CHUNK_SIZE
+        )
+    
+    def open_with_pandas():
+        print(f"✓ Opened watch history (streamed in chunks of {HISTORY_CHUNK_SIZE:,} rows)")
+        return read_with_pandas()
+    
+    if pa_csv is None:
+        return open_with_pandas()
+    
+    # Arrow's streaming reader parses one block at a time, so only the current
+    # batch is ever held in memory. Its default null markers match pandas' for
+    # the values a title or date can plausibly hold.
+    try:
+        reader = pa_csv.open_csv(
+            csv_path,
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=columns,
+                column_types={col: pyarrow.string() for col in columns},
+                strings_can_be_null=True
+            )
+        )
+    except pyarrow.ArrowInvalid as e:
+        print(f"Arrow could not parse {csv_path} ({e}); reading it with pandas")
+        return open_with_pandas()
+    
+    print("✓ Opened watch history (streamed in Arrow record batches)")
+    return stream_history_batches(csv_path, reader, read_with_pandas)
+
+def stream_history_batches(csv_path, reader, read_with_pandas):
+    """Yield Arrow record batches as DataFrames, finishing with pandas after a malformed row"""
+    
+    # Arrow rejects rows with too many or too few fields, which pandas reads
+    # (extra fields dropped, missing ones <NA>). On the first such row, pandas
+    # takes over and skips the rows already yielded.
+    yielded = 0
+    try:
+        for batch in reader:
+            yield batch.to_pandas(types_mapper={pyarrow.string(): pd.StringDtype()}.get)
+            yielded += batch.num_rows
+    except pyarrow.ArrowInvalid as e:
+        print(f"Arrow could not parse {csv_path} ({e}); reading the rest with pandas")
+        for chunk in read_with_pandas():
+            if yielded >= len(chunk):
+                yielded -= len(chunk)
+                continue
+            yield chunk.iloc[yielded:]
+            yielded = 0
 
 def load_data():
     """Load all necessary data files"""
@@ -9,196 +164,296 @@ def load_data():
     
     try:
         # Load movie data
-        moviedata_df = pd.read_csv('moviedata.csv')
+        moviedata_df = load_cached_csv('moviedata.csv', MOVIEDATA_COLUMNS)
+        for col in ('primaryTitle', 'originalTitle'):
+            moviedata_df[col] = moviedata_df[col].astype(TITLE_DTYPE)
         print(f"✓ Loaded {len(moviedata_df)} movie entries")
         
         # Load alternative titles
-        alttitles_df = pd.read_csv('alternatetitles.csv')
+        alttitles_df = load_cached_csv('alternatetitles.csv', ALTTITLES_COLUMNS)
+        alttitles_df['title'] = alttitles_df['title'].astype(TITLE_DTYPE)
         print(f"✓ Loaded {len(alttitles_df)} alternative titles")
         
-        # Load watch history - this is what we want to sum
-        watchhistory_df = pd.read_csv('watchhistory.csv')
-        print(f"✓ Loaded {len(watchhistory_df)} watch history entries")
+        # Alt titles only resolve through a movie entry, so drop the ones whose
+        # titleId is not in the movie data before anything scans them
+        alttitles_df = alttitles_df[alttitles_df['titleId'].isin(moviedata_df['tconst'])].reset_index(drop=True)
+        print(f"✓ Kept {len(alttitles_df)} alternative titles with a movie entry")
         
-        return moviedata_df, alttitles_df, watchhistory_df
+        # Open watch history - this is what we want to sum. It is streamed in
+        # chunks; only the title and date columns are read, as strings, and
+        # open_history_chunks reports which reader it settled on
+        history_chunks = open_history_chunks('watchhistory.csv')
+        
+        return moviedata_df, alttitles_df, history_chunks
         
     except Exception as e:
         print(f"Error loading data: {e}")
         return None, None, None
 
 def clean_title_for_matching(title):
-    """Clean title for better matching"""
-    if pd.isna(title) or not isinstance(title, str):
-        return ""
-    
+    """Clean title for better matching (title is always a str)"""
     # Remove common prefixes/suffixes that might interfere
     cleaned = title.strip()
     
     # Remove year patterns like (2020) or [2020]
-    cleaned = re.sub(r'\s*[\(\[]\d{4}[\)\]]\s*', '', cleaned)
+    cleaned = _YEAR_RE.sub('', cleaned)
     
     # Remove "Season X:" patterns for TV shows
-    cleaned = re.sub(r':\s*Season\s+\d+\s*:', ':', cleaned)
+    cleaned = _SEASON_RE.sub(':', cleaned)
     
     return cleaned.strip()
 
 def extract_variations(title):
-    """Extract different title variations for matching"""
-    if pd.isna(title) or not isinstance(title, str):
-        return [""]
-    
+    """Extract different title variations for matching (title is always a str)"""
     variations = []
     cleaned = clean_title_for_matching(title)
     
     # Original cleaned title
     variations.append(cleaned)
     
-    # Episode title (last part after colon)
     if ':' in cleaned:
-        episode_title = cleaned.split(':')[-1].strip()
+        parts = cleaned.split(':')
+        
+        # Episode title (last part after colon)
+        episode_title = parts[-1].strip()
         if episode_title:
             variations.append(episode_title)
-    
-    # Series title (first part before colon)
-    if ':' in cleaned:
-        series_title = cleaned.split(':')[0].strip()
+        
+        # Series title (first part before colon)
+        series_title = parts[0].strip()
         if series_title:
             variations.append(series_title)
     
     # Remove "The" from beginning
-    for var in variations.copy():
-        if var.lower().startswith('the '):
-            variations.append(var[4:].strip())
+    stripped = [_THE_RE.sub('', var, count=1).strip() for var in variations]
+    variations.extend([new for new, var in zip(stripped, variations) if new and new != var])
     
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_variations = []
+    # Remove duplicates (ignoring case, as the lookups do) while preserving
+    # order; the variations keep their casing for the diagnostics
+    unique = {}
     for var in variations:
-        if var and var not in seen:
-            seen.add(var)
-            unique_variations.append(var)
+        if var:
+            unique.setdefault(var.casefold(), var)
+    return tuple(unique.values())
+
+# Diagnostic labels for exact matches, by index source
+EXACT_MATCH_LABELS = {
+    'primary': 'Direct match (primary)',
+    'original': 'Direct match (original)',
+    'alt': 'Alt title exact'
+}
+
+def build_title_indexes(moviedata_df, alttitles_df):
+    """Build the casefolded title lookup dicts once so exact matches are a hash probe"""
+    
+    rows = np.arange(len(moviedata_df))
+    tconsts = moviedata_df['tconst'].to_numpy()
+    
+    # Parse runtimes once; -1 marks missing values (IMDb uses \N)
+    runtimes = pd.to_numeric(moviedata_df['runtimeMinutes'].replace(['\\N', 'N/A', ''], np.nan), errors='coerce')
+    runtimes = runtimes.fillna(-1).astype(np.int32).to_numpy()
+    
+    # First row wins for duplicate tconsts
+    tconst_to_row = dict(zip(tconsts[::-1], rows[::-1]))
+    
+    # One dict for all exact strategies: every casefolded primary, original
+    # and alternative title maps to (row, source). Candidates are listed in
+    # priority order so drop_duplicates keeps primary over original over alt.
+    def folded(titles):
+        return titles.astype(str).str.casefold().where(titles.notna())
+    
+    primary_folded = folded(moviedata_df['primaryTitle'])
+    alt_folded = folded(alttitles_df['title'])
+    candidates = pd.concat([
+        pd.DataFrame({'key': primary_folded, 'row': rows, 'source': 'primary'}),
+        pd.DataFrame({'key': folded(moviedata_df['originalTitle']), 'row': rows, 'source': 'original'}),
+        pd.DataFrame({'key': alt_folded, 'row': alttitles_df['titleId'].map(tconst_to_row), 'source': 'alt'})
+    ], ignore_index=True).dropna(subset=['key', 'row'])
+    candidates['row'] = candidates['row'].astype(np.int64)
+    candidates = candidates[runtimes[candidates['row'].to_numpy()] > 0].drop_duplicates('key')
+    
+    indexes = {
+        'title_to_row': dict(zip(candidates['key'].tolist(), zip(candidates['row'].tolist(), candidates['source'].tolist()))),
+        'tconst_to_row': tconst_to_row,
+        'runtimes': runtimes,
+        'tconsts': tconsts,
+        # Casefolded title columns for the partial strategies, so each scan is
+        # a plain case-sensitive substring search (Arrow arrays scanned by
+        # match_substring when pyarrow is installed), plus the plain arrays
+        # the hits are read from by position
+        'primary_folded': pyarrow.array(primary_folded) if pc is not None else primary_folded,
+        'alt_folded': pyarrow.array(alt_folded) if pc is not None else alt_folded,
+        'primary_titles': moviedata_df['primaryTitle'].to_numpy(),
+        'primary_title_lengths': moviedata_df['primaryTitle'].str.len().fillna(0).to_numpy(dtype=np.int64),
+        'alt_title_ids': alttitles_df['titleId'].to_numpy(),
+        'alt_titles': alttitles_df['title'].to_numpy()
+    }
+    print(f"✓ Indexed {len(indexes['title_to_row'])} distinct titles")
     
-    return unique_variations
+    return indexes
 
-def find_runtime_enhanced(title_variations, moviedata_df, alttitles_df):
+def find_substring(folded_titles, key):
+    """Positions of the casefolded titles that contain the casefolded key"""
+    if pc is not None:
+        return pc.indices_nonzero(pc.match_substring(folded_titles, key)).to_numpy()
+    return np.flatnonzero(folded_titles.str.contains(key, regex=False, na=False).to_numpy(dtype=bool))
+
+def find_runtime_enhanced(title_variations, indexes):
     """Enhanced runtime finding with multiple strategies"""
     
-    for variation in title_variations:
-        if not variation:
-            continue
-            
-        # Strategy 1: Direct match in moviedata (primary title)
-        match = moviedata_df[moviedata_df['primaryTitle'].str.lower() == variation.lower()]
-        if not match.empty:
-            runtime = match.iloc[0]['runtimeMinutes']
-            if pd.notna(runtime) and str(runtime).strip() not in ['', '\\N', 'N/A']:
-                return int(float(runtime)), match.iloc[0]['tconst'], f"Direct match (primary): '{variation}'"
-        
-        # Strategy 2: Direct match in moviedata (original title)
-        match = moviedata_df[moviedata_df['originalTitle'].str.lower() == variation.lower()]
-        if not match.empty:
-            runtime = match.iloc[0]['runtimeMinutes']
-            if pd.notna(runtime) and str(runtime).strip() not in ['', '\\N', 'N/A']:
-                return int(float(runtime)), match.iloc[0]['tconst'], f"Direct match (original): '{variation}'"
-        
-        # Strategy 3: Partial match in moviedata (contains)
-        match = moviedata_df[moviedata_df['primaryTitle'].str.contains(re.escape(variation), case=False, na=False)]
-        if not match.empty:
+    # Bind the index lookups once; the variation loop below only does calls
+    runtimes = indexes['runtimes']
+    tconsts = indexes['tconsts']
+    title_get = indexes['title_to_row'].get
+    tconst_row_get = indexes['tconst_to_row'].get
+    primary_folded = indexes['primary_folded']
+    alt_folded = indexes['alt_folded']
+    primary_titles = indexes['primary_titles']
+    primary_title_lengths = indexes['primary_title_lengths']
+    alt_title_ids = indexes['alt_title_ids']
+    alt_titles = indexes['alt_titles']
+    
+    # Lookups use casefolded keys; variation keeps its casing for match_info
+    keyed_variations = [(variation, variation.casefold()) for variation in title_variations if variation]
+    
+    # Strategies 1, 2 and 4: exact primary, original or alternative title match.
+    # Every variation gets a dict probe before any substring scan runs
+    for variation, key in keyed_variations:
+        hit = title_get(key)
+        if hit is not None:
+            row, source = hit
+            return int(runtimes[row]), tconsts[row], f"{EXACT_MATCH_LABELS[source]}: '{variation}'"
+    
+    for variation, key in keyed_variations:
+        # Strategy 3: Partial match in moviedata (contains); a plain substring
+        # search of the casefolded variation in the casefolded titles
+        match = find_substring(primary_folded, key)
+        if match.size:
             # Get the shortest match (most likely to be exact)
-            match = match.loc[match['primaryTitle'].str.len().idxmin()]
-            runtime = match['runtimeMinutes']
-            if pd.notna(runtime) and str(runtime).strip() not in ['', '\\N', 'N/A']:
-                return int(float(runtime)), match['tconst'], f"Partial match (primary): '{variation}' → '{match['primaryTitle']}'"
-        
-        # Strategy 4: Alternative titles exact match
-        alt_match = alttitles_df[alttitles_df['title'].str.lower() == variation.lower()]
-        if not alt_match.empty:
-            tconst = alt_match.iloc[0]['titleId']
-            movie_match = moviedata_df[moviedata_df['tconst'] == tconst]
-            if not movie_match.empty:
-                runtime = movie_match.iloc[0]['runtimeMinutes']
-                if pd.notna(runtime) and str(runtime).strip() not in ['', '\\N', 'N/A']:
-                    return int(float(runtime)), tconst, f"Alt title exact: '{variation}'"
+            row = match[primary_title_lengths[match].argmin()]
+            if runtimes[row] > 0:
+                return int(runtimes[row]), tconsts[row], f"Partial match (primary): '{variation}' → '{primary_titles[row]}'"
         
         # Strategy 5: Alternative titles partial match
-        alt_match = alttitles_df[alttitles_df['title'].str.contains(re.escape(variation), case=False, na=False)]
-        if not alt_match.empty:
-            # Try first few matches
-            for _, alt_row in alt_match.head(3).iterrows():
-                tconst = alt_row['titleId']
-                movie_match = moviedata_df[moviedata_df['tconst'] == tconst]
-                if not movie_match.empty:
-                    runtime = movie_match.iloc[0]['runtimeMinutes']
-                    if pd.notna(runtime) and str(runtime).strip() not in ['', '\\N', 'N/A']:
-                        return int(float(runtime)), tconst, f"Alt title partial: '{variation}' → '{alt_row['title']}'"
+        alt_match = find_substring(alt_folded, key)
+        # Try first few matches
+        for pos in alt_match[:3]:
+            tconst = alt_title_ids[pos]
+            row = tconst_row_get(tconst)
+            if row is not None and runtimes[row] > 0:
+                return int(runtimes[row]), tconst, f"Alt title partial: '{variation}' → '{alt_titles[pos]}'"
     
     return None, None, "Not found"
 
-def analyze_watch_history(watchhistory_df, moviedata_df, alttitles_df):
-    """Analyze watch history and sum runtimes with enhanced matching"""
+def resolve_title(title_str, indexes):
+    """Resolve one raw title to (variations, runtime, tconst, match_info)"""
+    
+    # Most titles match as-is, so try the raw title before any cleaning work
+    hit = indexes['title_to_row'].get(title_str.casefold())
+    if hit is not None:
+        row, source = hit
+        runtime = int(indexes['runtimes'][row])
+        return (title_str,), runtime, indexes['tconsts'][row], f"{EXACT_MATCH_LABELS[source]}: '{title_str}'"
+    
+    # Get all variations of the title
+    variations = extract_variations(title_str)
+    
+    # Try to find runtime with enhanced matching
+    runtime, tconst, match_info = find_runtime_enhanced(variations, indexes)
+    
+    return variations, runtime, tconst, match_info
+
+def analyze_watch_history(history_chunks, indexes):
+    """Analyze watch history (a DataFrame or an iterable of DataFrame chunks) and sum runtimes with enhanced matching"""
+    if isinstance(history_chunks, pd.DataFrame):
+        history_chunks = [history_chunks]
     
     print("\n" + "="*70)
     print("ANALYZING WATCH HISTORY - ENHANCED MATCHING")
     print("="*70)
     
+    # Entries are stored column-wise (one list per field) rather than as a
+    # dict per row
     total_runtime = 0
-    found_entries = []
-    not_found_entries = []
+    found_entries = {'original_title': [], 'matched_via': [], 'runtime': [], 'tconst': [], 'date': []}
+    not_found_entries = {'original_title': [], 'variations_tried': [], 'reason': [], 'date': []}
     
-    print(f"\nProcessing {len(watchhistory_df)} titles...")
+    # Raw title -> (variations, runtime, tconst, match_info), least recently
+    # used first and capped at RESOLVED_CACHE_SIZE entries
+    resolved = OrderedDict()
     
-    for idx, row in watchhistory_df.head(20).iterrows():
-        title = row['Title']
-        date = row['Date']
-        
-        # Convert to string and handle NaN
-        title_str = str(title) if not pd.isna(title) else 'nan'
-        
-        if title_str in ['nan', 'None', ''] or title_str.strip() == '':
-            print(f"[{idx+1}/{len(watchhistory_df)}] Skipping empty: {title_str}")
-            not_found_entries.append({
-                'original_title': title_str,
-                'variations_tried': '',
-                'reason': 'Empty/Invalid title',
-                'date': date
-            })
+    print("\nProcessing titles...")
+    
+    processed = 0
+    for chunk in history_chunks:
+        total_runtime += analyze_history_chunk(chunk, processed, resolved, found_entries, not_found_entries, indexes)
+        processed += len(chunk)
+    
+    print(f"Processed {processed} titles")
+    
+    return {
+        'total_runtime': total_runtime,
+        'found_count': len(found_entries['runtime']),
+        'not_found_count': len(not_found_entries['reason']),
+        'found_entries': found_entries,
+        'not_found_entries': not_found_entries
+    }
+
+def analyze_history_chunk(chunk, offset, resolved, found_entries, not_found_entries, indexes):
+    """Match one watch history chunk, appending to the entry lists and the shared resolved cache; returns the chunk's runtime"""
+    
+    total_runtime = 0
+    
+    # Normalize column names and pull plain Python lists out of the chunk
+    columns = {col.lower(): col for col in chunk.columns}
+    title_col = chunk[columns.get('title', 'Title')]
+    date_col = chunk[columns['date']] if 'date' in columns else pd.Series([''] * len(chunk))
+    
+    # Every title is a str from here on; empty/invalid ones are flagged up front
+    title_text = title_col.fillna('nan').astype(str)
+    invalid = title_text.isin(['nan', 'None', '']) | (title_text.str.strip() == '')
+    
+    titles = title_text.tolist()
+    dates = date_col.fillna('').astype(str).tolist()
+    
+    for idx, (title_str, is_invalid, date) in enumerate(zip(titles, invalid.tolist(), dates), offset):
+        if is_invalid:
+            log.debug("[%d] Skipping empty: %s", idx + 1, title_str)
+            not_found_entries['original_title'].append(title_str)
+            not_found_entries['variations_tried'].append('')
+            not_found_entries['reason'].append('Empty/Invalid title')
+            not_found_entries['date'].append(date)
             continue
         
-        print(f"\n[{idx+1}/{len(watchhistory_df)}] Processing: '{title_str}'")
+        log.debug("[%d] Processing: '%s'", idx + 1, title_str)
         
-        # Get all variations of the title
-        variations = extract_variations(title_str)
-        print(f"  Trying variations: {variations}")
-        
-        # Try to find runtime with enhanced matching
-        runtime, tconst, match_info = find_runtime_enhanced(variations, moviedata_df, alttitles_df)
+        # Repeated titles (rewatches, duplicate exports) reuse the earlier result
+        result = resolved.get(title_str)
+        if result is not None:
+            resolved.move_to_end(title_str)
+        else:
+            result = resolved[title_str] = resolve_title(title_str, indexes)
+            if len(resolved) > RESOLVED_CACHE_SIZE:
+                resolved.popitem(last=False)
+        variations, runtime, tconst, match_info = result
+        log.debug("  Trying variations: %s", variations)
         
         if runtime:
             total_runtime += runtime
-            found_entries.append({
-                'original_title': title_str,
-                'matched_via': match_info,
-                'runtime': runtime,
-                'tconst': tconst,
-                'date': date
-            })
-            print(f"  ✓ FOUND: {match_info} - Runtime: {runtime} mins")
+            found_entries['original_title'].append(title_str)
+            found_entries['matched_via'].append(match_info)
+            found_entries['runtime'].append(runtime)
+            found_entries['tconst'].append(tconst)
+            found_entries['date'].append(date)
+            log.debug("  ✓ FOUND: %s - Runtime: %s mins", match_info, runtime)
         else:
-            not_found_entries.append({
-                'original_title': title_str,
-                'variations_tried': str(variations),
-                'reason': 'No matches found in any strategy',
-                'date': date
-            })
-            print(f"  ✗ NOT FOUND: Tried {len(variations)} variations")
+            not_found_entries['original_title'].append(title_str)
+            not_found_entries['variations_tried'].append(str(variations))
+            not_found_entries['reason'].append('No matches found in any strategy')
+            not_found_entries['date'].append(date)
+            log.debug("  ✗ NOT FOUND: Tried %d variations", len(variations))
     
-    return {
-        'total_runtime': total_runtime,
-        'found_count': len(found_entries),
-        'not_found_count': len(not_found_entries),
-        'found_entries': found_entries,
-        'not_found_entries': not_found_entries
-    }
+    return total_runtime
 
 def print_summary(results):
     """Print comprehensive summary"""
@@ -225,8 +480,8 @@ def print_summary(results):
     
     # Breakdown by matching strategy
     strategy_counts = {}
-    for entry in results['found_entries']:
-        strategy = entry['matched_via'].split(':')[0]
+    for matched_via in results['found_entries']['matched_via']:
+        strategy = matched_via.split(':')[0]
         strategy_counts[strategy] = strategy_counts.get(strategy, 0) + 1
     
     if strategy_counts:
@@ -251,10 +506,11 @@ def save_results(results):
     # Strategy breakdown
     strategy_counts = {}
     strategy_runtimes = {}
-    for entry in results['found_entries']:
-        strategy = entry['matched_via'].split(':')[0]
+    found_entries = results['found_entries']
+    for matched_via, runtime in zip(found_entries['matched_via'], found_entries['runtime']):
+        strategy = matched_via.split(':')[0]
         strategy_counts[strategy] = strategy_counts.get(strategy, 0) + 1
-        strategy_runtimes[strategy] = strategy_runtimes.get(strategy, 0) + entry['runtime']
+        strategy_runtimes[strategy] = strategy_runtimes.get(strategy, 0) + runtime
     
     # Build summary table
     summary_data = []
@@ -287,25 +543,30 @@ def save_results(results):
     ])
     
     # Add sample of found entries
-    for i, entry in enumerate(results['found_entries'][:10]):
-        summary_data.append([f'Found {i+1} - Title', entry['original_title']])
-        summary_data.append([f'Found {i+1} - Runtime', entry['runtime']])
-        summary_data.append([f'Found {i+1} - Strategy', entry['matched_via']])
+    found_sample = zip(found_entries['original_title'][:10], found_entries['runtime'][:10], found_entries['matched_via'][:10])
+    for i, (title, runtime, matched_via) in enumerate(found_sample):
+        summary_data.append([f'Found {i+1} - Title', title])
+        summary_data.append([f'Found {i+1} - Runtime', runtime])
+        summary_data.append([f'Found {i+1} - Strategy', matched_via])
     
     # Add sample of not found entries
-    if results['not_found_entries']:
+    not_found_entries = results['not_found_entries']
+    if not_found_entries['reason']:
         summary_data.extend([
             ['', ''],  # Separator
             ['NOT FOUND ENTRIES SAMPLE (First 10)', '']
         ])
         
-        for i, entry in enumerate(results['not_found_entries'][:10]):
-            summary_data.append([f'Not Found {i+1} - Title', entry['original_title']])
-            summary_data.append([f'Not Found {i+1} - Reason', entry['reason']])
+        not_found_sample = zip(not_found_entries['original_title'][:10], not_found_entries['reason'][:10])
+        for i, (title, reason) in enumerate(not_found_sample):
+            summary_data.append([f'Not Found {i+1} - Title', title])
+            summary_data.append([f'Not Found {i+1} - Reason', reason])
     
-    # Create DataFrame and save
-    summary_df = pd.DataFrame(summary_data, columns=['Metric', 'Value'])
-    summary_df.to_csv('runtime_summary.csv', index=False)
+    # Write the rows directly; same layout DataFrame.to_csv produced
+    with open('runtime_summary.csv', 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(['Metric', 'Value'])
+        writer.writerows(summary_data)
     
     print(f"✓ Saved comprehensive summary to 'runtime_summary.csv'")
     print(f"  Contains: Basic stats, strategy breakdown, and sample entries")
@@ -313,19 +574,29 @@ def save_results(results):
 
 def main():
     """Main execution"""
+    logging.basicConfig(level=logging.DEBUG if os.environ.get('VERBOSE') == '1' else logging.WARNING, format='%(message)s')
+    
     print("RUNTIME SUMMER - Enhanced Movie Runtime Calculator")
     print("="*70)
     print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     # Load data
-    moviedata_df, alttitles_df, watchhistory_df = load_data()
+    moviedata_df, alttitles_df, history_chunks = load_data()
     
     if moviedata_df is None:
         print("Failed to load data. Exiting.")
         return
     
-    # Analyze and sum runtimes
-    results = analyze_watch_history(watchhistory_df, moviedata_df, alttitles_df)
+    # Build lookup indexes once
+    indexes = build_title_indexes(moviedata_df, alttitles_df)
+    
+    # Analyze and sum runtimes; the watch history is streamed, so errors
+    # further into the file only surface here
+    try:
+        results = analyze_watch_history(history_chunks, indexes)
+    except HISTORY_READ_ERRORS as e:
+        print(f"Error reading watch history: {e}")
+        return
     
     # Print summary
     print_summary(results)